@@ -1,6 +1,20 @@
-from typing import Dict, Optional, Any, List
+from typing import Dict, Optional, Any, List, Tuple
 import requests
 import json
+import socket
+import time
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.retry import Retry
+try:
+    import ijson
+except ImportError:  # fall back to response.json() when ijson is unavailable
+    ijson = None
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib json module
+    orjson = None
 from langflow.base.models.model import LCModelComponent
 from langflow.field_typing import LanguageModel
 from langflow.inputs import MessageTextInput
@@ -21,6 +35,181 @@ MODELS_METADATA = {
     "gpt-3.5-turbo": {"icon": "brain", "description": "GPT-3.5 Turbo - Fast and efficient (16K context)"},
     "gpt-3.5-turbo-16k": {"icon": "brain", "description": "GPT-3.5 Turbo 16K - Extended context version"},
 }
+_MODEL_OPTIONS = list(MODELS_METADATA.keys())
+_MODEL_OPTIONS_META = list(MODELS_METADATA.values())
+
+def _dumps_pretty(data: Any) -> str:
+    """Serialize data as 2-space indented JSON, keeping non-ASCII characters as-is."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+def _loads(text: str) -> Any:
+    """Parse JSON text; orjson's decode error subclasses json.JSONDecodeError."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+# Research API endpoints: localhost first, then the Docker host
+_API_URLS = ("http://localhost:8771/research", "http://host.docker.internal:8771/research")
+_JSON_HEADERS = {"Content-Type": "application/json"}  # treat as read-only
+
+# Shared session so repeated calls to the research API reuse keep-alive connections
+_SESSION = requests.Session()
+_RETRY = Retry(
+    total=3,
+    connect=0,  # connection failures fall through to the next URL instead
+    read=0,  # a timed-out POST may still be running server-side; re-sending starts another job
+    backoff_factor=0.5,
+    # Only responses that say the job was never started; the server reports every failure
+    # (including a bad API key) as 500, so retrying other 5xx repeats deterministic errors
+    status_forcelist=(429, 503),
+    allowed_methods=frozenset(["POST"]),
+    raise_on_status=False,
+)
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=_RETRY))
+_SESSION.headers.update(_JSON_HEADERS)
+
+# Research API URL that last accepted a TCP connection, probed once per process
+_RESOLVED_URL: Optional[str] = None
+
+def _resolve_api_url(api_urls: Tuple[str, ...]) -> Optional[str]:
+    """Return the first API URL whose host accepts a TCP connection, caching the winner."""
+    global _RESOLVED_URL
+    if _RESOLVED_URL is None:
+        for api_url in api_urls:
+            parsed = urlparse(api_url)
+            try:
+                socket.create_connection((parsed.hostname, parsed.port), timeout=0.5).close()
+            except OSError:
+                continue
+            _RESOLVED_URL = api_url
+            break
+    return _RESOLVED_URL
+
+def _forget_resolved_url() -> None:
+    """Drop the cached API URL so the next request probes again."""
+    global _RESOLVED_URL
+    _RESOLVED_URL = None
+
+class _CircuitBreaker:
+    """Per-URL circuit breaker so an unreachable API URL is skipped instead of retried every call."""
+    
+    def __init__(self, failure_threshold: int = 1, recovery_time: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+    
+    def allow(self, url: str) -> bool:
+        """Return True when the circuit is CLOSED, or HALF_OPEN after the recovery window."""
+        opened_at = self._opened_at.get(url)
+        if opened_at is None:
+            return True
+        return time.monotonic() - opened_at >= self.recovery_time
+    
+    def record_success(self, url: str) -> None:
+        """Close the circuit for url."""
+        self._failures.pop(url, None)
+        self._opened_at.pop(url, None)
+    
+    def record_failure(self, url: str) -> None:
+        """Count a failure for url, (re)opening its circuit once the threshold is reached."""
+        failures = self._failures.get(url, 0) + 1
+        self._failures[url] = failures
+        if failures >= self.failure_threshold:
+            self._opened_at[url] = time.monotonic()
+
+_BREAKER = _CircuitBreaker()
+
+# Error reported when no API URL accepted a connection, i.e. the server is not running yet
+_UNREACHABLE_ERROR = "Could not connect to research API on any URL"
+
+def _is_connect_failure(exc: requests.exceptions.ConnectionError) -> bool:
+    """Return True if the request never reached the server, so another URL may be tried."""
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    # requests wraps urllib3's MaxRetryError, whose reason is the underlying failure
+    reason = getattr(exc.args[0], "reason", None) if exc.args else None
+    return isinstance(reason, NewConnectionError)
+
+# Top-level fields of the research response that the component outputs read
+_RESPONSE_FIELDS = frozenset({
+    "topic", "status", "error", "research_cycles_completed",
+    "final_summary", "final_report", "all_search_results",
+})
+
+def _read_body_json(response: requests.Response) -> Any:
+    """Read the response body into a buffer in 64 KiB chunks and parse it in place."""
+    # One buffer per call: a shared one would make every response wait on the slowest download
+    body = bytearray()
+    for chunk in response.iter_content(chunk_size=65536):
+        body.extend(chunk)
+    if orjson is not None:
+        with memoryview(body) as view:
+            return orjson.loads(view)
+    return json.loads(body)
+
+def _read_research_response(response: requests.Response) -> Dict[str, Any]:
+    """Incrementally decode a streamed research response, keeping only known fields."""
+    with response:
+        if ijson is None:
+            return {key: value for key, value in _read_body_json(response).items() if key in _RESPONSE_FIELDS}
+        response.raw.decode_content = True
+        return {
+            key: value
+            for key, value in ijson.kvitems(response.raw, "", use_float=True)
+            if key in _RESPONSE_FIELDS
+        }
+
+def _post_research(topic: str, cycles: int, tavily_api_key: str, openai_api_key: str, openai_model: str) -> Dict[str, Any]:
+    """POST a research request, falling back across the known API URLs."""
+    try:
+        # Built once and reused for every URL attempt and retry
+        payload = {
+            "topic": topic,
+            "cycles": cycles,
+            "tavily_api_key": tavily_api_key,
+            "openai_api_key": openai_api_key,
+            "openai_model": openai_model,
+            "output_file": "report.md"
+        }
+        
+        # Skip straight to the URL that answered the pre-flight probe
+        api_urls = _API_URLS
+        resolved_url = _resolve_api_url(api_urls)
+        if resolved_url:
+            api_urls = (resolved_url,) + tuple(url for url in api_urls if url != resolved_url)
+        
+        for api_url in api_urls:
+            if not _BREAKER.allow(api_url):
+                continue
+            try:
+                response = _SESSION.post(
+                    api_url,
+                    json=payload,
+                    timeout=(3.05, 300),  # short connect, long read
+                    stream=True
+                )
+            except requests.exceptions.ConnectionError as e:
+                if not _is_connect_failure(e):
+                    raise  # read timeouts and dropped connections are reported, not re-sent
+                _BREAKER.record_failure(api_url)
+                if api_url == resolved_url:
+                    _forget_resolved_url()
+                continue
+            _BREAKER.record_success(api_url)
+            response.raise_for_status()
+            return _read_research_response(response)
+        
+        raise Exception(_UNREACHABLE_ERROR)
+        
+    except Exception as e:
+        return {
+            "error": str(e),
+            "topic": topic,
+            "status": "failed"
+        }
 
 class DeepQResearchTool(Component):
     """A tool that performs deep research on a given topic using Tavily search and OpenAI."""
@@ -61,9 +250,9 @@ class DeepQResearchTool(Component):
             name="openai_model",
             display_name="OpenAI Model",
             info="Select the OpenAI model to use for research",
-            options=list(MODELS_METADATA.keys()),
+            options=_MODEL_OPTIONS,
             value="gpt-4o-mini",
-            options_metadata=[MODELS_METADATA[model] for model in MODELS_METADATA.keys()],
+            options_metadata=_MODEL_OPTIONS_META,
         ),
     ]
     
@@ -82,40 +271,28 @@ class DeepQResearchTool(Component):
     
     def _make_api_request(self) -> Dict[str, Any]:
         """Make the API request to the research service."""
-        try:
-            # Try localhost first, then docker internal
-            api_urls = ["http://localhost:8771/research", "http://host.docker.internal:8771/research"]
-            
-            payload = {
-                "topic": self.topic,
-                "cycles": self.cycles,
-                "tavily_api_key": self.tavily_api_key,
-                "openai_api_key": self.openai_api_key,
-                "openai_model": self.openai_model,
-                "output_file": "report.md"
-            }
-            
-            for api_url in api_urls:
-                try:
-                    response = requests.post(
-                        api_url,
-                        json=payload,
-                        headers={"Content-Type": "application/json"},
-                        timeout=300
-                    )
-                    response.raise_for_status()
-                    return response.json()
-                except requests.exceptions.ConnectionError:
-                    continue
-            
-            raise Exception("Could not connect to research API on any URL")
-            
-        except Exception as e:
-            return {
-                "error": str(e),
-                "topic": self.topic,
-                "status": "failed"
-            }
+        # Every output calls this, so reuse the response until the inputs change
+        # The keys are part of it so that fixing a wrong key triggers a new request
+        cache_key = (self.topic, self.cycles, self.openai_model, self.tavily_api_key, self.openai_api_key)
+        if getattr(self, "_cached_result", None) is not None and getattr(self, "_cache_key", None) == cache_key:
+            return self._cached_result
+        
+        result = _post_research(
+            self.topic, self.cycles, self.tavily_api_key, self.openai_api_key, self.openai_model
+        )
+        self._cached_json_text = None
+        # Errors are cached too: re-sending a request that reached the server starts another
+        # job. Only "server not started yet" is left uncached so the next output retries
+        self._cached_result = None if result.get("error") == _UNREACHABLE_ERROR else result
+        self._cache_key = cache_key
+        return result
+    
+    def _get_json_text(self) -> str:
+        """Return the research response serialized as indented JSON, encoding it once per response."""
+        result = self._make_api_request()
+        if getattr(self, "_cached_json_text", None) is None:
+            self._cached_json_text = _dumps_pretty(result)
+        return self._cached_json_text
     
     def get_research_results(self) -> Message:
         """Return formatted research results as a Message object."""
@@ -124,29 +301,23 @@ class DeepQResearchTool(Component):
         if "error" in result:
             text = f"Error performing research: {result['error']}"
         else:
-            # Format the response
-            formatted_response = []
+            # Format the response, one section per available field
+            summary = f"Summary:\n{result['final_summary']}\n" if "final_summary" in result else None
+            report = f"Detailed Report:\n{result['final_report']}\n" if "final_report" in result else None
             
-            if "final_summary" in result:
-                formatted_response.append(f"Summary:\n{result['final_summary']}\n")
-                
-            if "final_report" in result:
-                formatted_response.append(f"Detailed Report:\n{result['final_report']}\n")
-                
-            if "all_search_results" in result and isinstance(result["all_search_results"], list):
-                formatted_response.append("\nSources:")
-                for i, source in enumerate(result["all_search_results"][:5], 1):
-                    if isinstance(source, dict):
-                        title = source.get("title", f"Source {i}")
-                        url = source.get("url", "")
-                        formatted_response.append(f"{i}. {title}")
-                        if url:
-                            formatted_response.append(f"   URL: {url}")
-                
-                if len(result["all_search_results"]) > 5:
-                    formatted_response.append(f"... and {len(result['all_search_results']) - 5} more sources")
+            sources = None
+            search_results = result.get("all_search_results")
+            if isinstance(search_results, list):
+                source_lines = "".join(
+                    f"\n{i}. {source.get('title', f'Source {i}')}"
+                    + (f"\n   URL: {source['url']}" if source.get("url") else "")
+                    for i, source in enumerate(search_results[:5], 1)
+                    if isinstance(source, dict)
+                )
+                more = f"\n... and {len(search_results) - 5} more sources" if len(search_results) > 5 else ""
+                sources = f"\nSources:{source_lines}{more}"
             
-            text = "\n".join(formatted_response)
+            text = "\n".join(section for section in (summary, report, sources) if section is not None)
             
         return Message(
             text=text,
@@ -156,8 +327,7 @@ class DeepQResearchTool(Component):
     
     def get_json_data(self) -> Message:
         """Return raw JSON data as Message object"""
-        result = self._make_api_request()
-        json_text = json.dumps(result, indent=2, ensure_ascii=False)
+        json_text = self._get_json_text()
         
         return Message(
             text=json_text,
@@ -205,9 +375,9 @@ class DeepQComponent(LCModelComponent):
             name="openai_model",
             display_name="OpenAI Model",
             info="Select the OpenAI model to use for research",
-            options=list(MODELS_METADATA.keys()),
+            options=_MODEL_OPTIONS,
             value="gpt-4o-mini",
-            options_metadata=[MODELS_METADATA[model] for model in MODELS_METADATA.keys()],
+            options_metadata=_MODEL_OPTIONS_META,
         ),
     ]
     
@@ -234,40 +404,28 @@ class DeepQComponent(LCModelComponent):
     
     def _make_api_request(self) -> Dict[str, Any]:
         """Make the API request and return JSON response"""
-        try:
-            # Try localhost first, then docker internal
-            api_urls = ["http://localhost:8771/research", "http://host.docker.internal:8771/research"]
-            
-            payload = {
-                "topic": self.topic,
-                "cycles": self.cycles,
-                "tavily_api_key": self.tavily_api_key,
-                "openai_api_key": self.openai_api_key,
-                "openai_model": self.openai_model,
-                "output_file": "report.md"
-            }
-            
-            for api_url in api_urls:
-                try:
-                    response = requests.post(
-                        api_url,
-                        json=payload,
-                        headers={"Content-Type": "application/json"},
-                        timeout=300
-                    )
-                    response.raise_for_status()
-                    return response.json()
-                except requests.exceptions.ConnectionError:
-                    continue
-            
-            raise Exception("Could not connect to research API on any URL")
-            
-        except Exception as e:
-            return {
-                "error": str(e),
-                "topic": self.topic,
-                "status": "failed"
-            }
+        # Every output calls this, so reuse the response until the inputs change
+        # The keys are part of it so that fixing a wrong key triggers a new request
+        cache_key = (self.topic, self.cycles, self.openai_model, self.tavily_api_key, self.openai_api_key)
+        if getattr(self, "_cached_result", None) is not None and getattr(self, "_cache_key", None) == cache_key:
+            return self._cached_result
+        
+        result = _post_research(
+            self.topic, self.cycles, self.tavily_api_key, self.openai_api_key, self.openai_model
+        )
+        self._cached_json_text = None
+        # Errors are cached too: re-sending a request that reached the server starts another
+        # job. Only "server not started yet" is left uncached so the next output retries
+        self._cached_result = None if result.get("error") == _UNREACHABLE_ERROR else result
+        self._cache_key = cache_key
+        return result
+    
+    def _get_json_text(self) -> str:
+        """Return the research response serialized as indented JSON, encoding it once per response."""
+        result = self._make_api_request()
+        if getattr(self, "_cached_json_text", None) is None:
+            self._cached_json_text = _dumps_pretty(result)
+        return self._cached_json_text
     
     def get_research_message(self) -> Message:
         """Return only the final report as Message object, without repeating the question/topic."""
@@ -285,8 +443,7 @@ class DeepQComponent(LCModelComponent):
     
     def get_json_data(self) -> Message:
         """Return raw JSON data as Message object"""
-        json_response = self._make_api_request()
-        json_text = json.dumps(json_response, indent=2, ensure_ascii=False)
+        json_text = self._get_json_text()
         
         return Message(
             text=json_text,
@@ -296,8 +453,7 @@ class DeepQComponent(LCModelComponent):
     
     def get_text_output(self) -> str:
         """Return JSON as string for Text Output"""
-        json_response = self._make_api_request()
-        return json.dumps(json_response, indent=2, ensure_ascii=False)
+        return self._get_json_text()
 
 
 # JSON Formatter Component - Compatible with above
@@ -305,6 +461,40 @@ from langflow.custom import Component
 from langflow.io import HandleInput, Output, DropdownInput
 from langflow.schema.message import Message
 
+def _md_sources(results: Any) -> str:
+    """Render the sources block of the Markdown summary."""
+    if not isinstance(results, list):
+        return ""
+    
+    parts = [f"**Sources Analyzed:** {len(results)}\n\n"]
+    
+    # Show top sources
+    if len(results) > 0:
+        parts.append("### Key Sources:\n")
+        for i, result in enumerate(results[:5]):  # Show first 5
+            if isinstance(result, dict):
+                if 'url' in result:
+                    parts.append(f"- [{result.get('title', f'Source {i+1}')}]({result['url']})\n")
+                elif 'title' in result:
+                    parts.append(f"- {result['title']}\n")
+                else:
+                    parts.append(f"- Source {i+1}\n")
+        if len(results) > 5:
+            parts.append(f"- ... and {len(results) - 5} more sources\n")
+        parts.append("\n")
+    
+    return "".join(parts)
+
+# Markdown renderers for the well-known research response fields, in display order
+_MD_SECTIONS = {
+    'topic': lambda value: f"# Research Report: {value}\n\n",
+    'final_summary': lambda value: f"## Summary\n{value}\n\n",
+    'final_report': lambda value: f"## Final Report\n{value}\n\n",
+    'research_cycles_completed': lambda value: f"**Research Cycles:** {value}\n\n",
+    'all_search_results': _md_sources,
+}
+_MD_KNOWN = frozenset(_MD_SECTIONS) | {'error'}
+
 class JSONFormatterComponent(Component):
     display_name = "JSON Formatter"
     description = "Takes JSON input, formats it nicely, and outputs it as a clean message for Chat Output"
@@ -347,9 +537,21 @@ class JSONFormatterComponent(Component):
             else:
                 input_text = str(self.json_input)
             
-            # Try to parse as JSON
+            # Only objects and arrays are worth formatting; skip the parse for anything else
+            if input_text.lstrip()[:1] not in ('{', '['):
+                return Message(
+                    text=f"Input is not valid JSON, returning as text:\n\n{input_text}",
+                    sender="JSON Formatter"
+                )
+            
+            # Try to parse as JSON, reusing the last parse when the input is unchanged
             try:
-                json_data = json.loads(input_text)
+                if getattr(self, "_last_input_text", None) == input_text:
+                    json_data = self._last_parsed
+                else:
+                    json_data = _loads(input_text)
+                    self._last_input_text = input_text
+                    self._last_parsed = json_data
             except json.JSONDecodeError:
                 # If not valid JSON, return as is
                 return Message(
@@ -357,22 +559,9 @@ class JSONFormatterComponent(Component):
                     sender="JSON Formatter"
                 )
             
-            # Format based on selected type
-            if self.format_type == "Pretty JSON":
-                formatted_text = json.dumps(json_data, indent=2, ensure_ascii=False)
-                formatted_text = f"```json\n{formatted_text}\n```"
-                
-            elif self.format_type == "Markdown Summary":
-                formatted_text = self._format_as_markdown(json_data)
-                
-            elif self.format_type == "Key Points":
-                formatted_text = self._format_as_key_points(json_data)
-                
-            elif self.format_type == "Final Report Only":
-                formatted_text = self._format_final_report(json_data)
-                
-            else:  # Raw Text
-                formatted_text = self._format_as_raw_text(json_data)
+            # Format based on selected type, defaulting to Raw Text
+            formatter = self._FORMATTERS.get(self.format_type, JSONFormatterComponent._format_as_raw_text)
+            formatted_text = formatter(self, json_data)
             
             return Message(
                 text=formatted_text,
@@ -386,60 +575,39 @@ class JSONFormatterComponent(Component):
                 sender="JSON Formatter"
             )
     
+    def _format_as_pretty_json(self, data: Any) -> str:
+        """Render JSON as an indented fenced code block"""
+        return f"```json\n{_dumps_pretty(data)}\n```"
+    
     def _format_as_markdown(self, data: Dict[str, Any]) -> str:
         """Convert JSON to a nice markdown format"""
         if not isinstance(data, dict):
             return f"**Data:** {str(data)}"
         
-        markdown = ""
+        # Single pass: pick out the known sections and render any other scalar fields
+        sections = {}
+        extra = []
+        for key, value in data.items():
+            if key in _MD_KNOWN:
+                sections[key] = value
+            elif isinstance(value, (str, int, float, bool)):
+                extra.append(f"**{key.replace('_', ' ').title()}:** {value}\n\n")
+        
+        parts = []
         
         # Handle error responses
-        if 'error' in data:
-            markdown += f"# Research Error\n\n**Error:** {data['error']}\n\n"
-            if 'topic' in data:
-                markdown += f"**Topic:** {data['topic']}\n\n"
-            return markdown
+        if 'error' in sections:
+            parts.append(f"# Research Error\n\n**Error:** {sections['error']}\n\n")
+            if 'topic' in sections:
+                parts.append(f"**Topic:** {sections['topic']}\n\n")
+            return "".join(parts)
         
         # Handle successful research responses
-        if 'topic' in data:
-            markdown += f"# Research Report: {data['topic']}\n\n"
-        
-        if 'final_summary' in data:
-            markdown += f"## Summary\n{data['final_summary']}\n\n"
-        
-        if 'final_report' in data:
-            markdown += f"## Final Report\n{data['final_report']}\n\n"
-        
-        if 'research_cycles_completed' in data:
-            markdown += f"**Research Cycles:** {data['research_cycles_completed']}\n\n"
-        
-        if 'all_search_results' in data and isinstance(data['all_search_results'], list):
-            markdown += f"**Sources Analyzed:** {len(data['all_search_results'])}\n\n"
-            
-            # Show top sources
-            if len(data['all_search_results']) > 0:
-                markdown += "### Key Sources:\n"
-                for i, result in enumerate(data['all_search_results'][:5]):  # Show first 5
-                    if isinstance(result, dict):
-                        if 'url' in result:
-                            title = result.get('title', f'Source {i+1}')
-                            url = result['url']
-                            markdown += f"- [{title}]({url})\n"
-                        elif 'title' in result:
-                            markdown += f"- {result['title']}\n"
-                        else:
-                            markdown += f"- Source {i+1}\n"
-                if len(data['all_search_results']) > 5:
-                    markdown += f"- ... and {len(data['all_search_results']) - 5} more sources\n"
-                markdown += "\n"
-        
-        # Add any other fields
-        for key, value in data.items():
-            if key not in ['topic', 'final_summary', 'final_report', 'research_cycles_completed', 'all_search_results', 'error']:
-                if isinstance(value, (str, int, float, bool)):
-                    markdown += f"**{key.replace('_', ' ').title()}:** {value}\n\n"
-        
-        return markdown
+        for key, render in _MD_SECTIONS.items():
+            if key in sections:
+                parts.append(render(sections[key]))
+        parts.extend(extra)
+        return "".join(parts)
     
     def _format_as_key_points(self, data: Dict[str, Any]) -> str:
         """Extract key points from the JSON"""
@@ -458,7 +626,11 @@ class JSONFormatterComponent(Component):
             points.append(f"📋 **Topic:** {data['topic']}")
         
         if 'final_summary' in data:
-            summary = data['final_summary'][:200] + "..." if len(str(data['final_summary'])) > 200 else data['final_summary']
+            summary = data['final_summary']
+            if not isinstance(summary, str):
+                summary = str(summary)
+            if len(summary) > 200:
+                summary = summary[:200] + "..."
             points.append(f"📝 **Summary:** {summary}")
         
         if 'research_cycles_completed' in data:
@@ -488,14 +660,14 @@ class JSONFormatterComponent(Component):
         """Show only the final report section."""
         if not isinstance(data, dict):
             return str(data)
-        report = ""
-        if 'topic' in data:
-            report += f"# {data['topic']}\n\n"
-        if 'final_report' in data:
-            report += data['final_report']
-        else:
-            report += "No final report available."
-        return report
-
-
-        
\ No newline at end of file
+        heading = f"# {data['topic']}\n\n" if 'topic' in data else ""
+        return heading + data.get('final_report', "No final report available.")
+    
+    # Format type -> formatter, looked up once per format_json call
+    _FORMATTERS = {
+        "Pretty JSON": _format_as_pretty_json,
+        "Markdown Summary": _format_as_markdown,
+        "Key Points": _format_as_key_points,
+        "Raw Text": _format_as_raw_text,
+        "Final Report Only": _format_final_report,
+    }
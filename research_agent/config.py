@@ -7,8 +7,15 @@ class ResearchConfig(BaseModel):
     max_research_cycles: int = 3
     max_search_results_per_query: int = 10
     max_urls_to_scrape_per_cycle: int = 5
+    max_concurrent_scrapes: int = 5
+    # Search and scrape for the next cycle while reflecting on the current one
+    speculative: bool = True
     search_engine: str = "tavily"
     summary_max_tokens: int = 2000
+    # Cycles summarized per LLM call; above 1, one structured call also plans the next queries
+    summary_batch_size: int = 1
+    llm_cache_size: int = 256
+    max_summary_input_chars: int = 20000
     topic: Optional[str] = None
     # OpenAI Configuration
     openai_api_key: Optional[str] = None
@@ -30,5 +30,5 @@ def create_structured_output_chain(prompt_template, output_parser, api_key: str,
     return (
         RunnablePassthrough.assign(prompt=prompt) 
         | (lambda x: {"output": llm.invoke(x["prompt"])})
-        | (lambda x: output_parser.parse(x["output"]))
+        | (lambda x: output_parser.parse(x["output"].content if hasattr(x["output"], 'content') else str(x["output"])))
     )
@@ -123,17 +123,13 @@ When creating search queries:
 Your output must ONLY be the search query in keyword form, not a question.
 """
 
-# Prompt for summarizing search results
-SUMMARIZATION_PROMPT = """
+# Prompts for summarizing search results. The instructions are a fixed system
+# prompt and the per-cycle data goes last, so provider-side prompt caching can
+# reuse the static prefix across cycles.
+SUMMARIZATION_SYSTEM_PROMPT = """
 You are a market intelligence research assistant compiling findings for ICP analysis.
 
-TOPIC: {topic}
-
-Search results to summarize:
-{search_results}
-
-Previous summary (if any):
-{current_summary}
+You will be given a research topic, the previous summary (if any), and new search results.
 
 Produce a detailed, structured summary focusing on:
 1. Pain points, feature requests, and frustrations from customers.
@@ -146,16 +142,21 @@ Integrate new findings with the existing summary for a coherent narrative.
 Use figures, examples, and dates when possible.
 """
 
-# Prompt for reflection on current research
-REFLECTION_PROMPT = """
-You are a market intelligence research assistant evaluating ICP research progress.
-
+SUMMARIZATION_USER_PROMPT = """
 TOPIC: {topic}
 
-Current research summary:
+Previous summary (if any):
 {current_summary}
 
-Based on this:
+Search results to summarize:
+{search_results}
+"""
+
+# Prompts for reflection on current research, split the same way
+REFLECTION_SYSTEM_PROMPT = """
+You are a market intelligence research assistant evaluating ICP research progress.
+
+You will be given a research topic and the current research summary. Based on the summary:
 1. Identify missing data or unclear points in pain point analysis.
 2. Highlight any uncertainty in TAM/SAM/SOM estimates.
 3. Note gaps in customer segment profiling.
@@ -165,6 +166,34 @@ Based on this:
 Be thorough and precise — your goal is to guide the next research cycle toward a complete ICP profile.
 """
 
+REFLECTION_USER_PROMPT = """
+TOPIC: {topic}
+
+Current research summary:
+{current_summary}
+"""
+
+# Prompt for summarizing several research cycles in one structured call
+BATCH_SUMMARIZATION_PROMPT = """
+You are a market intelligence research assistant compiling findings for ICP analysis.
+
+TOPIC: {topic}
+
+Previous summary (if any):
+{current_summary}
+
+Search results from the latest research cycles:
+{search_results}
+
+1. Produce a detailed, structured summary that integrates these results with the previous summary, focusing on:
+   customer pain points, market size (TAM, SAM, SOM), customer segments, 5-year growth projections,
+   and financial information about target companies. Use figures, examples, and dates when possible.
+2. List the knowledge gaps that remain.
+3. Suggest {num_queries} search queries, in keyword form, that would best fill those gaps.
+
+{format_instructions}
+"""
+
 # Chain of thought query generation
 CHAIN_OF_THOUGHT_QUERY_PROMPT = """
 You are a market intelligence research assistant focused on ICP profiling.
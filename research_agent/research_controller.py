@@ -1,26 +1,59 @@
 # research_agent/research_controller.py
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Awaitable, Tuple, TypeVar, Union
+import asyncio
+import hashlib
+import io
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pydantic import BaseModel, Field
+from langchain.schema import BaseMessage, HumanMessage, SystemMessage
+from langchain.output_parsers import PydanticOutputParser
 
 from .config import ResearchConfig
 from .llm import get_llm, create_structured_output_chain
-from .web_search import WebSearcher
+from .web_search import WebSearcher, clean_query
 from .web_scraper import WebScraper
 from .prompt_templates import (
     SEARCH_QUERY_GENERATION_PROMPT,
     CHAIN_OF_THOUGHT_QUERY_PROMPT,
-    SUMMARIZATION_PROMPT,
-    REFLECTION_PROMPT,
+    SUMMARIZATION_SYSTEM_PROMPT,
+    SUMMARIZATION_USER_PROMPT,
+    REFLECTION_SYSTEM_PROMPT,
+    REFLECTION_USER_PROMPT,
+    BATCH_SUMMARIZATION_PROMPT,
     FINAL_REPORT_PROMPT
 )
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+def _run_coroutine(coro: Awaitable[T]) -> T:
+    """Run a coroutine to completion from synchronous code.
+    
+    asyncio.run() refuses to start inside a thread that already has a running
+    event loop (e.g. a FastAPI handler), so in that case the coroutine gets its
+    own loop on a worker thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
 class SearchQuery(BaseModel):
     """Structure for search queries."""
     query: str = Field(description="The search query to be used")
 
+class BatchSummary(BaseModel):
+    """Structure for a summary covering several research cycles."""
+    summary: str = Field(description="The updated research summary")
+    gaps: List[str] = Field(description="Knowledge gaps that remain")
+    next_queries: List[str] = Field(description="Search queries for the next research cycles")
+
 class ResearchController:
     """Controls the research process workflow."""
     
@@ -33,6 +66,11 @@ class ResearchController:
             tavily_api_key=config.tavily_api_key
         )
         self.web_scraper = WebScraper()
+        # Exact-match prompt cache: prompt digest -> response text, oldest evicted first
+        self._llm_cache = OrderedDict()
+        self._llm_cache_lock = threading.Lock()
+        self._batch_parser = PydanticOutputParser(pydantic_object=BatchSummary)
+        self._batch_summary_chain = None  # built on first use
         self.reset()
     
     def reset(self):
@@ -41,6 +79,34 @@ class ResearchController:
         self.research_cycles_completed = 0
         self.all_search_results = []
         self.sources = []  # Track unique sources
+        self._source_urls = set()  # URLs already in self.sources
+        self._pending_batch = []  # (search_results, scraped_contents) awaiting a batched summary
+        self._planned_queries = []  # queries suggested by the last batched summary
+    
+    def _invoke_cached(self, prompt: Union[str, List[BaseMessage]]) -> str:
+        """Invoke the LLM, returning the cached response text for a previously seen prompt."""
+        if isinstance(prompt, str):
+            prompt_text = prompt
+        else:
+            prompt_text = "\x00".join(f"{message.type}:{message.content}" for message in prompt)
+        key = hashlib.blake2b(prompt_text.encode(), digest_size=16).hexdigest()
+        with self._llm_cache_lock:
+            cached = self._llm_cache.get(key)
+            if cached is not None:
+                self._llm_cache.move_to_end(key)
+        if cached is not None:
+            logger.info("Using cached LLM response")
+            return cached
+        
+        response = self.llm.invoke(prompt)
+        
+        # Get the content from the AIMessage object
+        response_text = response.content if hasattr(response, 'content') else str(response)
+        with self._llm_cache_lock:
+            self._llm_cache[key] = response_text
+            if len(self._llm_cache) > self.config.llm_cache_size:
+                self._llm_cache.popitem(last=False)
+        return response_text
     
     def generate_search_query(self) -> str:
         """Generate a search query based on the current research state using Chain of Thought reasoning."""
@@ -49,9 +115,9 @@ class ResearchController:
             current_summary=self.current_summary if self.current_summary else "No research has been done yet."
         )
         
+        # Not cached: an unchanged summary (e.g. after a cycle with no results) must still
+        # yield a fresh query rather than repeating the one that just failed
         response = self.llm.invoke(prompt)
-        
-        # Get the content from the AIMessage object
         response_text = response.content if hasattr(response, 'content') else str(response)
         
         # Clean up the response to get just the query
@@ -66,6 +132,13 @@ class ResearchController:
         logger.info(f"Generated search query: {query}")
         return query
 
+    def next_search_query(self) -> str:
+        """Return the next query planned by a batched summary, or generate a new one."""
+        if self._planned_queries:
+            query = self._planned_queries.pop(0)
+            logger.info(f"Using planned search query: {query}")
+            return query
+        return self.generate_search_query()
     
     def perform_web_search(self, query: str) -> List[Dict[str, Any]]:
         """Perform a web search with the given query."""
@@ -75,63 +148,135 @@ class ResearchController:
     
     def scrape_search_results(self, search_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Scrape content from the URLs in search results."""
-        scraped_contents = []
-        
         # Limit the number of URLs to scrape
         urls_to_scrape = [
             result["href"] for result in search_results[:self.config.max_urls_to_scrape_per_cycle]
         ]
         
-        for url in urls_to_scrape:
-            content = self.web_scraper.scrape_url(url)
-            if content:
-                scraped_contents.append(content)
+        # Fetch all URLs concurrently; failed scrapes come back as None
+        results = _run_coroutine(
+            self.web_scraper.scrape_urls(urls_to_scrape, max_concurrency=self.config.max_concurrent_scrapes)
+        )
+        scraped_contents = [content for content in results if content]
         
         logger.info(f"Scraped {len(scraped_contents)} URLs successfully")
         return scraped_contents
     
-    def update_summary(self, search_results: List[Dict[str, Any]], scraped_contents: List[Dict[str, Any]]) -> str:
-        """Update the research summary with new information."""
-        # Prepare search results for summarization
-        formatted_results = []
+    def _format_results_for_summary(self, search_results: List[Dict[str, Any]], scraped_contents: List[Dict[str, Any]]) -> str:
+        """Format search results and scraped snippets for the summarization prompt.
         
-        for i, result in enumerate(search_results):
-            result_text = f"Result {i+1}:\nTitle: {result['title']}\nSource: {result['href']}\nSummary: {result['body']}\n"
-            formatted_results.append(result_text)
+        Identical snippets are included once, and entries stop being added once
+        the text would exceed config.max_summary_input_chars.
+        """
+        def entries():
+            for i, result in enumerate(search_results):
+                yield f"Result {i+1}:\nTitle: {result['title']}\nSource: {result['href']}\nSummary: {result['body']}\n"
+            
+            # Add scraped content snippets, skipping pages that resolve to the same article
+            seen_snippets = set()
+            for i, content in enumerate(scraped_contents):
+                # Add a snippet of the content (first 500 chars)
+                content_snippet = content["content"][:500] + "..." if len(content["content"]) > 500 else content["content"]
+                digest = hashlib.sha1(content_snippet.encode(), usedforsecurity=False).digest()
+                if digest in seen_snippets:
+                    continue
+                seen_snippets.add(digest)
+                yield f"Scraped Content {i+1}:\nTitle: {content['title']}\nSource: {content['url']}\nContent: {content_snippet}\n"
         
-        # Add scraped content snippets
-        for i, content in enumerate(scraped_contents):
-            # Add a snippet of the content (first 500 chars)
-            content_snippet = content["content"][:500] + "..." if len(content["content"]) > 500 else content["content"]
-            result_text = f"Scraped Content {i+1}:\nTitle: {content['title']}\nSource: {content['url']}\nContent: {content_snippet}\n"
-            formatted_results.append(result_text)
+        max_chars = self.config.max_summary_input_chars
+        buffer = io.StringIO()
+        total_chars = 0
+        for entry in entries():
+            separator = "\n" if total_chars else ""
+            if total_chars + len(separator) + len(entry) > max_chars:
+                logger.info(f"Summary input capped at {max_chars} characters")
+                break
+            buffer.write(separator)
+            buffer.write(entry)
+            total_chars += len(separator) + len(entry)
         
-        # Join all formatted results
-        all_results_text = "\n".join(formatted_results)
+        return buffer.getvalue()
+    
+    def update_summary(
+        self,
+        search_results: List[Dict[str, Any]],
+        scraped_contents: List[Dict[str, Any]],
+        all_results_text: Optional[str] = None
+    ) -> str:
+        """Update the research summary with new information.
         
-        # Create summarization prompt
-        prompt = SUMMARIZATION_PROMPT.format(
-            topic=self.config.topic,
-            search_results=all_results_text,
-            current_summary=self.current_summary if self.current_summary else "No previous summary available."
-        )
+        all_results_text, when given, is used as the already formatted search material.
+        """
+        # Prepare search results for summarization
+        if all_results_text is None:
+            all_results_text = self._format_results_for_summary(search_results, scraped_contents)
+        
+        # Create summarization prompt: static instructions first, per-cycle data last
+        prompt = [
+            SystemMessage(content=SUMMARIZATION_SYSTEM_PROMPT),
+            HumanMessage(content=SUMMARIZATION_USER_PROMPT.format(
+                topic=self.config.topic,
+                search_results=all_results_text,
+                current_summary=self.current_summary if self.current_summary else "No previous summary available."
+            )),
+        ]
         
         # Generate the updated summary
-        response = self.llm.invoke(prompt)
-        updated_summary = response.content if hasattr(response, 'content') else str(response)
+        updated_summary = self._invoke_cached(prompt)
         logger.info("Summary updated successfully")
         
         return updated_summary
     
+    def flush_summary_batch(self):
+        """Summarize all pending cycles in one structured LLM call and queue its suggested queries."""
+        if not self._pending_batch:
+            return
+        
+        search_results = [result for results, _ in self._pending_batch for result in results]
+        scraped_contents = [content for _, contents in self._pending_batch for content in contents]
+        # Each cycle gets the full single-cycle input budget, so later cycles are not crowded out
+        results_text = "\n".join(
+            self._format_results_for_summary(results, contents) for results, contents in self._pending_batch
+        )
+        self._pending_batch = []
+        
+        if self._batch_summary_chain is None:
+            self._batch_summary_chain = create_structured_output_chain(
+                BATCH_SUMMARIZATION_PROMPT,
+                self._batch_parser,
+                api_key=self.config.openai_api_key,
+                model_name=self.config.openai_model
+            )
+        
+        try:
+            batch = self._batch_summary_chain.invoke({
+                "topic": self.config.topic,
+                "current_summary": self.current_summary if self.current_summary else "No previous summary available.",
+                "search_results": results_text,
+                "num_queries": self.config.summary_batch_size,
+                "format_instructions": self._batch_parser.get_format_instructions(),
+            })
+        except Exception as e:
+            # Fall back to a plain summary if the structured output could not be parsed
+            logger.warning(f"Batched summary failed, falling back to a plain summary: {e}")
+            self.current_summary = self.update_summary(search_results, scraped_contents, results_text)
+            return
+        
+        self.current_summary = batch.summary
+        self._planned_queries = [query for query in batch.next_queries if query.strip()][:self.config.summary_batch_size]
+        logger.info(f"Batched summary updated; remaining gaps: {batch.gaps}")
+    
     def reflect_on_research(self) -> str:
         """Reflect on the current state of research to identify gaps."""
-        prompt = REFLECTION_PROMPT.format(
-            topic=self.config.topic,
-            current_summary=self.current_summary
-        )
+        prompt = [
+            SystemMessage(content=REFLECTION_SYSTEM_PROMPT),
+            HumanMessage(content=REFLECTION_USER_PROMPT.format(
+                topic=self.config.topic,
+                current_summary=self.current_summary
+            )),
+        ]
         
-        response = self.llm.invoke(prompt)
-        reflection = response.content if hasattr(response, 'content') else str(response)
+        reflection = self._invoke_cached(prompt)
         logger.info("Completed reflection on current research")
         
         return reflection
@@ -139,33 +284,58 @@ class ResearchController:
     def update_sources(self, search_results: List[Dict[str, Any]]):
         """Update the list of unique sources."""
         for result in search_results:
-            source = {
+            url = result["href"]
+            if url in self._source_urls:
+                continue
+            self._source_urls.add(url)
+            self.sources.append({
                 "title": result["title"],
-                "url": result["href"],
+                "url": url,
                 "year": result.get("year", "N/A")  # Some search results might include year
-            }
-            if source not in self.sources:
-                self.sources.append(source)
+            })
     
-    def run_research_cycle(self) -> bool:
-        """Run a single research cycle."""
-        logger.info(f"Starting research cycle {self.research_cycles_completed + 1}")
+    def gather_sources(self, query: Optional[str] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Search and scrape for the next cycle, generating a query unless one is given.
         
+        This part of a cycle only reads the current summary, so it can run ahead of
+        the previous cycle's reflection.
+        """
         # 1. Generate search query
-        query = self.generate_search_query()
+        if query is None:
+            query = self.next_search_query()
         
         # 2. Perform web search
         search_results = self.perform_web_search(query)
         if not search_results:
-            logger.warning("No search results found. Cycle may not be productive.")
-            return False
+            return search_results, []
         
         # 3. Scrape content from search results
         scraped_contents = self.scrape_search_results(search_results)
+        return search_results, scraped_contents
+    
+    def run_research_cycle(
+        self,
+        query: Optional[str] = None,
+        prefetched: Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]] = None
+    ) -> bool:
+        """Run a single research cycle, reusing prefetched search results when given."""
+        logger.info(f"Starting research cycle {self.research_cycles_completed + 1}")
+        
+        search_results, scraped_contents = prefetched if prefetched is not None else self.gather_sources(query)
+        if not search_results:
+            logger.warning("No search results found. Cycle may not be productive.")
+            return False
         
-        # 4. Update the summary with new information
-        updated_summary = self.update_summary(search_results, scraped_contents)
-        self.current_summary = updated_summary
+        # 4. Update the summary with new information, batching cycles when configured.
+        # A batch is also flushed once its planned queries run out, so later cycles
+        # never search with a query generated from a stale summary.
+        if self.config.summary_batch_size > 1:
+            self._pending_batch.append((search_results, scraped_contents))
+            if len(self._pending_batch) >= self.config.summary_batch_size or not self._planned_queries:
+                self.flush_summary_batch()
+        else:
+            updated_summary = self.update_summary(search_results, scraped_contents)
+            self.current_summary = updated_summary
         
         # 5. Save search results and update sources
         self.all_search_results.extend(search_results)
@@ -176,6 +346,22 @@ class ResearchController:
         
         return True
     
+    async def _reflect_and_plan_next(self) -> Tuple[str, str]:
+        """Reflect on the research so far and generate the next search query concurrently."""
+        reflection, next_query = await asyncio.gather(
+            asyncio.to_thread(self.reflect_on_research),
+            asyncio.to_thread(self.next_search_query),
+        )
+        return reflection, next_query
+    
+    async def _reflect_and_prefetch_next(self) -> Tuple[str, Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+        """Reflect on the research so far while searching and scraping for the next cycle."""
+        reflection, prefetched = await asyncio.gather(
+            asyncio.to_thread(self.reflect_on_research),
+            asyncio.to_thread(self.gather_sources),
+        )
+        return reflection, prefetched
+    
     def run_full_research(self) -> Dict[str, Any]:
         """Run the complete research process."""
         # Reset state before starting new research
@@ -184,15 +370,28 @@ class ResearchController:
         logger.info(f"Starting full research on topic: {self.config.topic}")
         
         # Run the specified number of research cycles
-        for _ in range(self.config.max_research_cycles):
-            success = self.run_research_cycle()
+        next_query = None
+        prefetched = None
+        for cycle in range(self.config.max_research_cycles):
+            success = self.run_research_cycle(next_query, prefetched)
             if not success:
                 logger.warning("Research cycle was not successful. Moving to next cycle.")
+            next_query = prefetched = None
             
-            # After each cycle, reflect on the current state
-            reflection = self.reflect_on_research()
+            # After each cycle, reflect on the current state. The next cycle only depends
+            # on the summary, so its query (and, when speculative, its search and scrape)
+            # runs while the reflection does.
+            if cycle + 1 == self.config.max_research_cycles:
+                reflection = self.reflect_on_research()
+            elif self.config.speculative:
+                reflection, prefetched = _run_coroutine(self._reflect_and_prefetch_next())
+            else:
+                reflection, next_query = _run_coroutine(self._reflect_and_plan_next())
             logger.info(f"Reflection after cycle {self.research_cycles_completed}:\n{reflection}")
         
+        # Summarize any cycles still waiting on a batched summary
+        self.flush_summary_batch()
+        
         # Generate the final research report
         final_report = self.generate_final_report()
         
@@ -219,8 +418,7 @@ class ResearchController:
             sources_count=len(self.sources)
         )
         
-        response = self.llm.invoke(prompt)
-        final_report = response.content if hasattr(response, 'content') else str(response)
+        final_report = self._invoke_cached(prompt)
         logger.info("Generated final research report")
         
         # Append sources section at the end
@@ -1,110 +1,379 @@
 # research_agent/web_scraper.py
-import requests
-from bs4 import BeautifulSoup
+import httpx
+import ssl
+from selectolax.parser import HTMLParser
 import html2text
+import asyncio
+import io
 import logging
-from typing import Dict, Any, Optional
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-import urllib3
+import multiprocessing
+import os
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List, Optional, Tuple
+import zlib
+from urllib.parse import urlparse
+try:
+    import zstandard
+except ImportError:  # zstd is then simply not advertised
+    zstandard = None
 
 logger = logging.getLogger(__name__)
 
-class WebScraper:
-    """Scrapes web content from URLs with improved error handling and retries."""
+# Only codings _read_decoded can decompress with a bounded output size; brotli
+# has no portable way to cap a single decompress call, so br is never requested
+_ACCEPT_ENCODING = "gzip, deflate, zstd" if zstandard is not None else "gzip, deflate"
+
+# Headers to mimic a real browser
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": _ACCEPT_ENCODING,
+    "Upgrade-Insecure-Requests": "1",
+}
+
+def _make_client() -> httpx.Client:
+    """Build a pooled HTTP/2 client that retries failed connections."""
+    # Pooling and HTTP/2 settings live on the transport; Client ignores them when one is passed
+    transport = httpx.HTTPTransport(
+        retries=3,
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    )
+    return httpx.Client(transport=transport, timeout=15, headers=HEADERS, follow_redirects=True)
+
+# Shared across all scrapers so keep-alive connections and TLS sessions are reused
+_CLIENT = _make_client()
+
+def _is_ssl_error(exc: BaseException) -> bool:
+    """Return True if exc was caused by an SSL/certificate failure."""
+    while exc is not None:
+        if isinstance(exc, ssl.SSLError):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+# Scraped pages keyed by URL -> (fetched_at, etag, last_modified, result), shared by all scrapers
+_SCRAPE_CACHE: "OrderedDict[str, Tuple[float, Optional[str], Optional[str], Dict[str, Any]]]" = OrderedDict()
+_SCRAPE_CACHE_LOCK = threading.Lock()
+_SCRAPE_CACHE_SIZE = 512
+_SCRAPE_CACHE_TTL = 600  # seconds a cached page is served without revalidating it
+
+def _cache_get(url: str) -> Optional[Tuple[float, Optional[str], Optional[str], Dict[str, Any]]]:
+    """Return the cached entry for url, marking it as recently used."""
+    with _SCRAPE_CACHE_LOCK:
+        entry = _SCRAPE_CACHE.get(url)
+        if entry is not None:
+            _SCRAPE_CACHE.move_to_end(url)
+        return entry
+
+def _cache_put(url: str, etag: Optional[str], last_modified: Optional[str], result: Dict[str, Any]) -> None:
+    """Store a scrape result with its validators, evicting the least recently used entry when full."""
+    with _SCRAPE_CACHE_LOCK:
+        _SCRAPE_CACHE[url] = (time.monotonic(), etag, last_modified, result)
+        _SCRAPE_CACHE.move_to_end(url)
+        if len(_SCRAPE_CACHE) > _SCRAPE_CACHE_SIZE:
+            _SCRAPE_CACHE.popitem(last=False)
+
+# Decoded HTML read per page; enough to yield the 50 KB text limit once markup is stripped.
+# _read_decoded never decompresses past it, so a compressed bomb is cut off too
+_MAX_HTML_BYTES = 200_000
+# Pages advertising a larger body are skipped without reading it
+_MAX_CONTENT_LENGTH = 5 * 1024 * 1024
+_HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+# URL path suffixes that are never HTML pages; rejected before any request is made
+_NON_HTML_SUFFIXES = (
+    ".pdf", ".zip", ".gz", ".tar", ".rar", ".7z",
+    ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx",
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg",
+    ".mp3", ".wav", ".mp4", ".mov", ".avi", ".webm",
+)
+
+class _ChunkReader(io.RawIOBase):
+    """Readable file over an iterator of byte chunks, for zstandard's stream_reader."""
+    
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._pending = b""
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._pending = chunk
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+def _read_decoded(response: httpx.Response, limit: int) -> Optional[bytes]:
+    """Read and decompress the body of a streamed response, stopping after limit + 1 bytes.
+    
+    Decoding is done here rather than by httpx, which decompresses each network chunk
+    in one unbounded call. Returns None for a content coding that was not requested.
+    """
+    encoding = response.headers.get("Content-Encoding", "identity").strip().lower()
+    raw = response.iter_raw(chunk_size=16384)
+    body = bytearray()
+    
+    if encoding in ("identity", ""):
+        for chunk in raw:
+            body.extend(chunk)
+            if len(body) > limit:
+                break
+    elif encoding in ("gzip", "x-gzip", "deflate"):
+        # MAX_WBITS | 32 accepts both gzip and zlib framing
+        decoder = zlib.decompressobj(zlib.MAX_WBITS | 32)
+        first = True
+        for chunk in raw:
+            try:
+                data = decoder.decompress(chunk, limit + 1 - len(body))
+            except zlib.error:
+                # Some servers send "deflate" as raw deflate without the zlib header
+                if not (first and encoding == "deflate"):
+                    raise
+                decoder = zlib.decompressobj(-zlib.MAX_WBITS)
+                data = decoder.decompress(chunk, limit + 1 - len(body))
+            first = False
+            body.extend(data)
+            if len(body) > limit or decoder.eof:
+                break
+    elif encoding == "zstd" and zstandard is not None:
+        reader = zstandard.ZstdDecompressor().stream_reader(_ChunkReader(raw), read_across_frames=True)
+        while len(body) <= limit:
+            data = reader.read(limit + 1 - len(body))
+            if not data:
+                break
+            body.extend(data)
+    else:
+        return None
+    return bytes(body)
+
+def _fetch_html(client: httpx.Client, url: str, request_headers: Dict[str, str]) -> Tuple[httpx.Response, Optional[str]]:
+    """Stream url, returning the response and up to _MAX_HTML_BYTES of its HTML.
     
-    def __init__(self):
-        self.html_converter = html2text.HTML2Text()
-        self.html_converter.ignore_links = False
-        self.html_converter.ignore_images = True
-        self.html_converter.ignore_tables = False
+    The body is None when the status is not 200 or the response is not an HTML
+    page of acceptable size; in those cases it is never downloaded.
+    """
+    with client.stream("GET", url, headers=request_headers) as response:
+        if response.status_code != 200:
+            return response, None
         
-        # Configure session with retries
-        self.session = requests.Session()
-        retry_strategy = Retry(
-            total=3,  # number of retries
-            backoff_factor=1,  # wait 1, 2, 4 seconds between retries
-            status_forcelist=[429, 500, 502, 503, 504],  # HTTP status codes to retry on
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        content_type = response.headers.get("Content-Type", "")
+        if content_type and not content_type.lower().startswith(_HTML_CONTENT_TYPES):
+            logger.warning(f"Skipping non-HTML URL: {url} ({content_type})")
+            return response, None
         
-        # Configure headers to mimic a real browser
-        self.headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate, br",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1",
-        }
+        content_length = response.headers.get("Content-Length", "")
+        if content_length.isdigit() and int(content_length) > _MAX_CONTENT_LENGTH:
+            logger.warning(f"Skipping oversized URL: {url} ({content_length} bytes)")
+            return response, None
         
-        # Disable SSL verification warnings
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        # Leaving the block after a capped read closes the connection mid-body
+        body = _read_decoded(response, _MAX_HTML_BYTES)
+        if body is None:
+            logger.warning(f"Skipping URL with unsupported encoding: {url} ({response.headers.get('Content-Encoding')})")
+            return response, None
+        return response, body.decode(response.encoding or "utf-8", errors="replace")
+
+# Elements whose text is boilerplate rather than page content
+_STRIP_TAGS = ["script", "style", "nav", "footer", "header"]
+_TITLE_SELECTOR = "title"
+
+# One converter per process, built on first use by _extract
+_HTML_CONVERTER: Optional[html2text.HTML2Text] = None
+
+def _get_html_converter() -> html2text.HTML2Text:
+    """Return this process's html2text converter, creating it on first use."""
+    global _HTML_CONVERTER
+    if _HTML_CONVERTER is None:
+        _HTML_CONVERTER = html2text.HTML2Text()
+        _HTML_CONVERTER.ignore_links = False
+        _HTML_CONVERTER.ignore_images = True
+        _HTML_CONVERTER.ignore_tables = False
+    return _HTML_CONVERTER
+
+def _extract(html: str, preserve_links: bool = False) -> Tuple[str, str]:
+    """Parse html and return its (title, text) with whitespace collapsed.
     
-    def scrape_url(self, url: str) -> Optional[Dict[str, Any]]:
-        """Scrape content from a given URL with improved error handling."""
+    Kept at module level so it can run in the parse worker processes.
+    """
+    tree = HTMLParser(html)
+    tree.strip_tags(_STRIP_TAGS)
+    
+    if preserve_links:
+        # html2text re-serializes and re-parses the page, so it only runs when links are wanted
+        text = _get_html_converter().handle(tree.html or "")
+    else:
+        root = tree.body or tree.root
+        text = root.text(separator=" ") if root is not None else ""
+    
+    title_tag = tree.css_first(_TITLE_SELECTOR)
+    title = title_tag.text() if title_tag else ""
+    return title, " ".join(text.split())
+
+# Parsing is CPU-bound, so batches of pages are parsed in worker processes
+_PARSE_POOL: Optional[ProcessPoolExecutor] = None
+_PARSE_POOL_LOCK = threading.Lock()
+
+# Forking a multi-threaded server can copy locks held by other threads into the
+# workers, so they are started from a clean forkserver (spawn where unavailable)
+_PARSE_POOL_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+def _get_parse_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Return the shared parse pool, creating it with at most max_workers workers on first use."""
+    global _PARSE_POOL
+    with _PARSE_POOL_LOCK:
+        if _PARSE_POOL is None:
+            # os.cpu_count() ignores container CPU quotas, so never exceed the batch size either
+            workers = max(1, min(max_workers, os.cpu_count() or 1))
+            _PARSE_POOL = ProcessPoolExecutor(max_workers=workers, mp_context=_PARSE_POOL_CONTEXT)
+        return _PARSE_POOL
+
+def _discard_parse_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken parse pool so the next batch starts a fresh one."""
+    global _PARSE_POOL
+    with _PARSE_POOL_LOCK:
+        if _PARSE_POOL is pool:
+            _PARSE_POOL = None
+    pool.shutdown(wait=False)
+
+class WebScraper:
+    """Scrapes web content from URLs with improved error handling and retries."""
+    
+    def __init__(self, preserve_links: bool = False):
+        # Keep links by converting pages to Markdown instead of plain text
+        self.preserve_links = preserve_links
+    
+    def _download(self, url: str) -> Tuple[Optional[Dict[str, Any]], Optional[httpx.Headers], Optional[str]]:
+        """Fetch url without parsing it.
+        
+        Returns (result, None, None) when the cache can answer, (None, headers, html)
+        for a freshly downloaded page and (None, None, None) when there is nothing to parse.
+        """
         logger.info(f"Scraping URL: {url}")
         
+        if urlparse(url).path.lower().endswith(_NON_HTML_SUFFIXES):
+            logger.warning(f"Skipping non-HTML URL: {url}")
+            return None, None, None
+        
+        # Serve recent pages straight from the cache, otherwise revalidate with a conditional GET
+        cached = _cache_get(url)
+        request_headers = {}
+        if cached is not None:
+            fetched_at, etag, last_modified, cached_result = cached
+            if time.monotonic() - fetched_at < _SCRAPE_CACHE_TTL:
+                logger.info(f"Using cached content for URL: {url}")
+                return dict(cached_result), None, None
+            if etag:
+                request_headers["If-None-Match"] = etag
+            if last_modified:
+                request_headers["If-Modified-Since"] = last_modified
+        
         try:
-            # Try with SSL verification first
-            try:
-                response = self.session.get(
-                    url,
-                    headers=self.headers,
-                    timeout=15,
-                    verify=True
-                )
-            except requests.exceptions.SSLError:
-                # If SSL verification fails, try without verification
-                logger.warning(f"SSL verification failed for {url}, retrying without verification")
-                response = self.session.get(
-                    url,
-                    headers=self.headers,
-                    timeout=15,
-                    verify=False
-                )
+            response, html = _fetch_html(_CLIENT, url, request_headers)
+            
+            if response.status_code == 304 and cached is not None:
+                logger.info(f"URL not modified, using cached content: {url}")
+                _cache_put(url, etag, last_modified, cached_result)
+                return dict(cached_result), None, None
             
             if response.status_code != 200:
                 logger.warning(f"Failed to fetch URL: {url}, status code: {response.status_code}")
-                return None
-            
-            # Add a small delay to be respectful to servers
-            time.sleep(1)
+                return None, None, None
             
-            soup = BeautifulSoup(response.text, "html.parser")
+            return None, response.headers, html
             
-            # Remove script and style elements
-            for script in soup(["script", "style", "nav", "footer", "header"]):
-                script.extract()
-            
-            # Get the text content
-            text = self.html_converter.handle(str(soup))
-            
-            # Extract title
-            title = ""
-            title_tag = soup.find("title")
-            if title_tag:
-                title = title_tag.get_text()
-            
-            # Clean up the text
-            text = ' '.join(text.split())  # Remove extra whitespace
-            
-            return {
-                "url": url,
-                "title": title,
-                "content": text[:50000],  # Limit content size
-                "status": "success"
-            }
-            
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             logger.error(f"Timeout while scraping URL {url}")
-            return None
-        except requests.exceptions.ConnectionError:
+        except httpx.ConnectError as e:
+            # Pages with broken certificates are skipped rather than refetched unverified
+            if _is_ssl_error(e):
+                logger.warning(f"SSL verification failed for URL {url}, skipping")
+            else:
+                logger.error(f"Connection error while scraping URL {url}")
+        except httpx.TransportError:
             logger.error(f"Connection error while scraping URL {url}")
-            return None
+        except Exception as e:
+            logger.error(f"Error scraping URL {url}: {e}")
+        return None, None, None
+    
+    def _store(self, url: str, headers: httpx.Headers, title: str, text: str) -> Dict[str, Any]:
+        """Build the result for a parsed page and cache it with its validators."""
+        result = {
+            "url": url,
+            "title": title,
+            "content": text[:50000],  # Limit content size
+            "status": "success"
+        }
+        _cache_put(url, headers.get("ETag"), headers.get("Last-Modified"), result)
+        return dict(result)
+    
+    def _parse(self, url: str, headers: httpx.Headers, html: str) -> Optional[Dict[str, Any]]:
+        """Extract a downloaded page in this process and cache the result."""
+        try:
+            title, text = _extract(html, self.preserve_links)
         except Exception as e:
             logger.error(f"Error scraping URL {url}: {e}")
             return None
+        return self._store(url, headers, title, text)
+    
+    def scrape_url(self, url: str) -> Optional[Dict[str, Any]]:
+        """Scrape content from a given URL with improved error handling."""
+        result, headers, html = self._download(url)
+        if html is None:
+            return result
+        return self._parse(url, headers, html)
+    
+    async def scrape_urls(self, urls: List[str], max_concurrency: int = 5) -> List[Optional[Dict[str, Any]]]:
+        """Scrape several URLs concurrently, returning results in the same order as urls.
+        
+        All pages are downloaded first, then parsed in parallel in the shared process pool.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def download(url: str) -> Tuple[Optional[Dict[str, Any]], Optional[httpx.Headers], Optional[str]]:
+            async with semaphore:
+                # _download blocks on the network, so run it off the event loop
+                return await asyncio.to_thread(self._download, url)
+        
+        downloads = await asyncio.gather(*(download(url) for url in urls))
+        results = [result for result, _, _ in downloads]
+        pending = [i for i, (_, _, html) in enumerate(downloads) if html is not None]
+        if not pending:
+            return results
+        
+        loop = asyncio.get_running_loop()
+        pool = _get_parse_pool(max_concurrency)
+        try:
+            parsed = await asyncio.gather(
+                *(loop.run_in_executor(pool, _extract, downloads[i][2], self.preserve_links) for i in pending),
+                return_exceptions=True,
+            )
+        except BrokenProcessPool:
+            parsed = [BrokenProcessPool()] * len(pending)
+        
+        if any(isinstance(outcome, BrokenProcessPool) for outcome in parsed):
+            logger.warning("Parse worker pool failed, parsing pages in-process")
+            _discard_parse_pool(pool)
+        
+        for i, outcome in zip(pending, parsed):
+            url, (_, headers, html) = urls[i], downloads[i]
+            if isinstance(outcome, BrokenProcessPool):
+                results[i] = await asyncio.to_thread(self._parse, url, headers, html)
+            elif isinstance(outcome, BaseException):
+                logger.error(f"Error scraping URL {url}: {outcome}")
+            else:
+                title, text = outcome
+                results[i] = self._store(url, headers, title, text)
+        return results
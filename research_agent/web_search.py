@@ -3,22 +3,26 @@ from tavily import TavilyClient
 from typing import List, Dict, Any
 import logging
 import os
+import re
 
 logger = logging.getLogger(__name__)
 
+_THINK_RE = re.compile(r'<think>.*?</think>', re.DOTALL)
+_TAG_RE = re.compile(r'<.*?>')
+_WS_RE = re.compile(r'\s+')
+
 def clean_query(query: str) -> str:
-        """Remove thinking process and clean up the query."""
-        # Remove content between <think> and </think> tags
-        import re
-        clean_query = re.sub(r'<think>.*?</think>', '', query, flags=re.DOTALL)
-        
-        # Remove any remaining tags
-        clean_query = re.sub(r'<.*?>', '', clean_query)
-        
-        # Clean up whitespace
-        clean_query = re.sub(r'\s+', ' ', clean_query).strip()
-        
-        return clean_query
+    """Remove thinking process and clean up the query."""
+    # Remove content between <think> and </think> tags
+    clean_query = _THINK_RE.sub('', query)
+    
+    # Remove any remaining tags
+    clean_query = _TAG_RE.sub('', clean_query)
+    
+    # Clean up whitespace
+    clean_query = _WS_RE.sub(' ', clean_query).strip()
+    
+    return clean_query
 
 class WebSearcher:
     """Handles web searches using Tavily API."""
@@ -1,16 +1,24 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 import sys
 import os
+import asyncio
 import logging
 import json
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
 from datetime import datetime
 
 # Add the parent directory to Python path to import research_agent
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from research_agent.research_controller import ResearchController
 from research_agent.config import ResearchConfig
+from research_agent.web_search import WebSearcher
 
 # Configure logging with more detailed format
 logging.basicConfig(
@@ -26,7 +34,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Research Agent API",
     description="API for performing deep research using Tavily search and OpenAI",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse  # research responses carry large reports and result lists
 )
 
 # Initialize default config
@@ -55,6 +64,52 @@ class SearchResponse(BaseModel):
     query: str
     results: List[Dict[str, Any]]
 
+# Idle research controllers keyed by (model, OpenAI key digest, Tavily key digest).
+# Reusing them keeps the LLM client, Tavily client and response caches alive across
+# requests; each request checks a controller out so concurrent runs never share one.
+_MAX_POOLED_KEYS = 8
+_MAX_IDLE_PER_KEY = 4
+_controller_pool: "OrderedDict[Tuple[str, str, str], List[ResearchController]]" = OrderedDict()
+_controller_pool_lock = threading.Lock()
+
+def _key_digest(api_key: Optional[str]) -> str:
+    """Hash an API key so pool keys do not hold the raw secret."""
+    return hashlib.sha256(api_key.encode()).hexdigest() if api_key else ""
+
+@contextmanager
+def checkout_controller(config: ResearchConfig) -> Iterator[ResearchController]:
+    """Yield a pooled ResearchController for the config's model and API keys."""
+    pool_key = (config.openai_model, _key_digest(config.openai_api_key), _key_digest(config.tavily_api_key))
+    with _controller_pool_lock:
+        idle = _controller_pool.get(pool_key)
+        controller = idle.pop() if idle else None
+    
+    if controller is None:
+        logger.info("Creating a new research controller")
+        controller = ResearchController(config)
+    else:
+        logger.info("Reusing a pooled research controller")
+        controller.config = config
+    
+    try:
+        yield controller
+    finally:
+        with _controller_pool_lock:
+            idle = _controller_pool.setdefault(pool_key, [])
+            _controller_pool.move_to_end(pool_key)
+            if len(idle) < _MAX_IDLE_PER_KEY:
+                idle.append(controller)
+            while len(_controller_pool) > _MAX_POOLED_KEYS:
+                _controller_pool.popitem(last=False)
+
+@lru_cache(maxsize=1)
+def get_web_searcher() -> WebSearcher:
+    """Return the process-wide WebSearcher used by /search."""
+    return WebSearcher(
+        max_results=default_config.max_search_results_per_query,
+        tavily_api_key=default_config.tavily_api_key
+    )
+
 def log_config_update(config: ResearchConfig):
     """Log the current configuration settings."""
     logger.info("Current Research Agent Configuration:")
@@ -110,14 +165,13 @@ async def research(request: ResearchRequest):
         # Log the current configuration
         log_config_update(request_config)
         
-        # Create a new research controller with the request-specific config
-        request_research_controller = ResearchController(request_config)
-        
-        # Perform the research
-        start_time = datetime.now()
-        logger.info("Starting research process...")
-        results = request_research_controller.run_full_research()
-        end_time = datetime.now()
+        # Perform the research with a pooled controller for this model and keys
+        with checkout_controller(request_config) as request_research_controller:
+            start_time = datetime.now()
+            logger.info("Starting research process...")
+            # Research blocks on network and LLM calls; keep it off the event loop
+            results = await asyncio.to_thread(request_research_controller.run_full_research)
+            end_time = datetime.now()
         
         # Log research completion
         duration = (end_time - start_time).total_seconds()
@@ -146,12 +200,8 @@ async def search(request: SearchRequest):
         logger.info(f"Performing search for query: {request.query}")
         logger.info(f"Max results requested: {request.max_results}")
         
-        # Create a temporary research controller for search
-        temp_config = ResearchConfig()
-        temp_controller = ResearchController(temp_config)
-        
         start_time = datetime.now()
-        results = temp_controller.web_searcher.search(request.query)
+        results = await asyncio.to_thread(get_web_searcher().search, request.query)
         end_time = datetime.now()
         
         duration = (end_time - start_time).total_seconds()